@@ -1,6 +1,15 @@
 from .core import (
+    DEFAULT_HASH_ALGORITHM,
     WILDCARD_EXTENSION,
+    FileEntry,
+    FileFingerprint,
+    compute_blake3_hash,
+    compute_content_hash,
+    compute_fast_fingerprint,
     compute_md5_hash,
+    compute_md5_hash_batch,
+    compute_md5_hash_cached,
+    compute_md5_seg8_hash,
     compute_weak_hash,
     count_dir_files,
     ensure_dir,
@@ -8,17 +17,30 @@ from .core import (
     find_empty_directories,
     find_files,
     get_children_dirs,
+    hash_files,
     is_empty_dir,
+    looks_like_hex_hash,
     looks_like_md5_hash,
     matches_any_extension,
     safely_to_relative,
+    scan_files,
     suppressed_output,
     try_rmdir,
+    walk_and_hash,
 )
 
 __all__ = [
+    "DEFAULT_HASH_ALGORITHM",
     "WILDCARD_EXTENSION",
+    "FileEntry",
+    "FileFingerprint",
+    "compute_blake3_hash",
+    "compute_content_hash",
+    "compute_fast_fingerprint",
     "compute_md5_hash",
+    "compute_md5_hash_batch",
+    "compute_md5_hash_cached",
+    "compute_md5_seg8_hash",
     "compute_weak_hash",
     "count_dir_files",
     "ensure_dir",
@@ -26,10 +48,14 @@ __all__ = [
     "find_empty_directories",
     "find_files",
     "get_children_dirs",
+    "hash_files",
     "is_empty_dir",
+    "looks_like_hex_hash",
     "looks_like_md5_hash",
     "matches_any_extension",
     "safely_to_relative",
+    "scan_files",
     "suppressed_output",
     "try_rmdir",
+    "walk_and_hash",
 ]
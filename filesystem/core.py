@@ -1,14 +1,23 @@
 import contextlib
+import functools
 import hashlib
 import io
 import mmap
 import os
-import re
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Generator, Iterator, Optional
+from typing import Callable, Generator, Iterable, Iterator, NamedTuple, Optional
 
 import structlog
 
+try:
+    import blake3
+except ImportError:  # optional dependency
+    blake3 = None  # type: ignore[assignment]
+
 log = structlog.get_logger(__name__)
 
 
@@ -17,50 +26,400 @@ log = structlog.get_logger(__name__)
 # ==============================================================================
 EMPTY_FILE_MD5_HASH = "d41d8cd98f00b204e9800998ecf8427e"
 SMALL_CHUNK_SIZE = 4 * 1024  # 4 KB
+LARGE_CHUNK_SIZE = 1024 * 1024  # 1 MB
+# sha256 is hardware-accelerated (SHA-NI, ARMv8 crypto extensions) on most
+# modern CPUs, which makes it faster than md5 for content identity
+DEFAULT_HASH_ALGORITHM = "sha256"
+# below this size, reading a file is cheaper than setting up a memory map
+MMAP_THRESHOLD = 16 * 4096  # 64 KB
+# above this size, memory maps are not prefaulted up front
+MAP_POPULATE_THRESHOLD = 64 * 1024 * 1024  # 64 MB
+# below this size, blake3's thread pool costs more than it saves
+BLAKE3_MULTITHREADING_THRESHOLD = 1024 * 1024  # 1 MB
+MD5_BATCH_LANES = 8
+MD5_HASH_CACHE_SIZE = 100_000
+MD5_SEG8_LANES = 8
+# below this size, handing md5-seg8 lanes to threads costs more than it saves
+MD5_SEG8_MULTITHREADING_THRESHOLD = 1024 * 1024  # 1 MB
+
+# `hashlib.md5` is OpenSSL's assembly implementation whenever Python was built
+# against OpenSSL (falling back to the builtin `_md5` module otherwise); marking
+# it as not used for security keeps it available under FIPS-enforcing builds,
+# which would otherwise block md5 entirely
+_md5 = functools.partial(hashlib.md5, usedforsecurity=False)
+
+
+FileFingerprint = tuple[int, int, int, int, int]
+
+
+def compute_fast_fingerprint(filepath: Path) -> FileFingerprint:
+    """
+    Returns `(device, inode, size, mtime_ns, ctime_ns)` for `filepath` using a
+    single `stat` call, without reading the file.
+
+    Unchanged files keep the same fingerprint, so it can be used as a cache key
+    for content hashes: only compute the (expensive) content hash when the
+    fingerprint is not already known. `ctime_ns` is included because `mtime_ns`
+    can be restored after a rewrite (e.g., `cp -p`, `rsync -t`, `os.utime`).
+    """
+    st = os.stat(filepath)
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+def compute_md5_hash(filepath: Path, chunk_size: int = LARGE_CHUNK_SIZE) -> str:
+    file_size = filepath.stat().st_size
+    return _compute_md5_hash(filepath, file_size=file_size, chunk_size=chunk_size)
+
 
+def compute_md5_hash_cached(filepath: Path) -> str:
+    """
+    Like `compute_md5_hash`, but results are cached by path and fingerprint
+    (see `compute_fast_fingerprint`), so hashing an unchanged file again costs
+    a single `stat` call.
+    """
+    return _compute_md5_hash_cached(str(filepath), compute_fast_fingerprint(filepath))
+
+
+@functools.lru_cache(maxsize=MD5_HASH_CACHE_SIZE)
+def _compute_md5_hash_cached(filepath: str, fingerprint: FileFingerprint) -> str:
+    # `fingerprint` is part of the cache key, so modified files are re-hashed
+    _, _, file_size, _, _ = fingerprint
+    return _compute_md5_hash(Path(filepath), file_size=file_size)
 
-def compute_md5_hash(filepath: Path, chunk_size=SMALL_CHUNK_SIZE) -> str:
-    if filepath.stat().st_size == 0:
+
+def _compute_md5_hash(
+    filepath: Path, *, file_size: int, chunk_size: int = LARGE_CHUNK_SIZE
+) -> str:
+    if file_size == 0:
         return EMPTY_FILE_MD5_HASH
 
     log.debug(f"Computing md5 hash for: {filepath}")
-    hash_md5 = hashlib.md5()
-    with filepath.open("rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
+    if file_size <= chunk_size:
+        return _compute_md5_hash_sequentially(
+            filepath, file_size=file_size, chunk_size=chunk_size
+        )
+
+    hash_md5 = _md5()
+    with open(filepath, "rb", buffering=0) as f:
+        _advise_sequential_read(f.fileno(), prefetch=False)
+        for chunk in _read_chunks_in_background(f, chunk_size):
             hash_md5.update(chunk)
     return hash_md5.hexdigest()
 
 
 def compute_md5_hash_ssd(filepath: Path) -> str:
-    if filepath.stat().st_size == 0:
+    file_size = filepath.stat().st_size
+    if file_size == 0:
         # we need to handle this here because `mmap.mmap(...)` cannot map empty files
         return EMPTY_FILE_MD5_HASH
 
     log.debug(f"Computing md5 hash for: {filepath}")
-    hash_md5 = hashlib.md5()
+    if file_size <= MMAP_THRESHOLD:
+        return _compute_md5_hash_sequentially(filepath, file_size=file_size)
+
     with filepath.open("rb") as f:
-        # Memory-map the file, size 0 means whole file
-        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-            hash_md5.update(mm)
+        with _mmap_for_sequential_read(f.fileno(), file_size=file_size) as mm:
+            return _md5(mm).hexdigest()
+
+
+def _compute_md5_hash_sequentially(
+    filepath: Path, *, file_size: int, chunk_size: int = LARGE_CHUNK_SIZE
+) -> str:
+    """
+    Hashes `filepath` with plain reads into a single reused buffer (of up to
+    `chunk_size` bytes), after telling the kernel that the file will be read
+    once, front to back.
+    """
+    hash_md5 = _md5()
+    buffer = bytearray(min(file_size, chunk_size))
+    view = memoryview(buffer)
+    with open(filepath, "rb", buffering=0) as f:
+        _advise_sequential_read(f.fileno(), prefetch=True)
+        while n := f.readinto(buffer):
+            hash_md5.update(view[:n])
     return hash_md5.hexdigest()
 
 
-def compute_weak_hash(
-    filepath: Path, *, file_size: int, chunk_size: int = SMALL_CHUNK_SIZE
+def _read_chunks_in_background(f: io.FileIO, chunk_size: int) -> Iterator[memoryview]:
+    """
+    Yields consecutive chunks of `f`, read by a background thread into one of
+    two alternating buffers, so that reading the next chunk overlaps with
+    processing the current one (`hashlib` releases the GIL while hashing).
+
+    Each chunk is only valid until the next one is requested.
+    """
+    free_buffers: queue.Queue[Optional[bytearray]] = queue.Queue()
+    filled_buffers: queue.Queue[tuple[bytearray, int] | BaseException] = queue.Queue()
+    for _ in range(2):
+        free_buffers.put(bytearray(chunk_size))
+
+    def _read() -> None:
+        try:
+            # `None` means the consumer is done, possibly before EOF
+            while (buffer := free_buffers.get()) is not None:
+                n = f.readinto(buffer) or 0
+                filled_buffers.put((buffer, n))
+                if n == 0:
+                    return
+        except BaseException as e:
+            filled_buffers.put(e)
+
+    reader = threading.Thread(target=_read, daemon=True)
+    reader.start()
+    try:
+        while True:
+            item = filled_buffers.get()
+            if isinstance(item, BaseException):
+                raise item
+            buffer, n = item
+            if n == 0:
+                return
+            yield memoryview(buffer)[:n]
+            free_buffers.put(buffer)
+    finally:
+        free_buffers.put(None)
+        reader.join()
+
+
+def _mmap_for_sequential_read(fd: int, *, file_size: int) -> mmap.mmap:
+    """
+    Memory-maps the whole file behind `fd` for reading, hinting the kernel that
+    it will be read once, front to back.
+
+    Files up to `MAP_POPULATE_THRESHOLD` are prefaulted where supported (so
+    hashing doesn't stall on a page fault every 4 KB); larger ones are left to
+    kernel readahead, since prefaulting blocks until the whole file is read
+    (and thrashes for files larger than memory).
+    """
+    advice = ["MADV_SEQUENTIAL", "MADV_HUGEPAGE"]
+    # size 0 means whole file
+    if file_size > MAP_POPULATE_THRESHOLD:
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    elif hasattr(mmap, "MAP_POPULATE"):
+        mm = mmap.mmap(
+            fd, 0, flags=mmap.MAP_SHARED | mmap.MAP_POPULATE, prot=mmap.PROT_READ
+        )
+    else:
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        advice.append("MADV_WILLNEED")
+
+    # `madvise` flags are platform-specific, and only hints: failing to apply
+    # one (e.g., no huge pages for file mappings) is not an error
+    for name in advice:
+        if hasattr(mmap, name):
+            with contextlib.suppress(OSError):
+                mm.madvise(getattr(mmap, name))
+    return mm
+
+
+def _advise_sequential_read(fd: int, *, prefetch: bool) -> None:
+    """
+    Tells the kernel that the file behind `fd` will be read once, front to
+    back; with `prefetch`, also asks it to start reading the whole file now
+    (only sensible for small files, or pages get evicted before they're used).
+    """
+    # `posix_fadvise` is not available on every platform (e.g., macOS)
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        if prefetch:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+
+
+def compute_content_hash(
+    filepath: Path, algorithm: str = DEFAULT_HASH_ALGORITHM
 ) -> str:
+    """
+    Returns the hex digest of the contents of `filepath` using `algorithm`
+    (any fixed-length algorithm accepted by `hashlib.new`, as well as "blake3"
+    and "md5-seg8"). Variable-length algorithms such as "shake_128" raise
+    `ValueError`, since they have no default digest length.
+
+    Prefer this over `compute_md5_hash` when the hash is only used to identify
+    file contents (e.g., deduplication) rather than to interoperate with md5.
+    """
+    if algorithm == "blake3":
+        return compute_blake3_hash(filepath)
+    if algorithm == "md5-seg8":
+        return compute_md5_seg8_hash(filepath)
+
+    def new_hash() -> "hashlib._Hash":
+        # content identity, not security: keeps e.g. md5 usable under FIPS
+        return hashlib.new(algorithm, usedforsecurity=False)
+
+    if new_hash().digest_size == 0:
+        raise ValueError(f"{algorithm} is a variable-length hash algorithm")
+
+    log.debug(f"Computing {algorithm} hash for: {filepath}")
+    with filepath.open("rb") as f:
+        return hashlib.file_digest(f, new_hash).hexdigest()
+
+
+def compute_blake3_hash(filepath: Path) -> str:
+    """
+    Returns the blake3 hex digest of the contents of `filepath`.
+
+    Large files are memory-mapped and hashed with multiple threads (blake3 is a
+    Merkle tree, so a single stream can be split across cores). Requires the
+    optional `blake3` package.
+    """
+    if blake3 is None:
+        raise ImportError("`compute_blake3_hash` requires the `blake3` package")
+
+    log.debug(f"Computing blake3 hash for: {filepath}")
+    file_size = filepath.stat().st_size
+    if file_size <= MMAP_THRESHOLD:
+        return blake3.blake3(filepath.read_bytes()).hexdigest()
+
+    max_threads = 1
+    if file_size >= BLAKE3_MULTITHREADING_THRESHOLD:
+        max_threads = blake3.blake3.AUTO
     with filepath.open("rb") as f:
+        with _mmap_for_sequential_read(f.fileno(), file_size=file_size) as mm:
+            return blake3.blake3(mm, max_threads=max_threads).hexdigest()
+
+
+def compute_md5_seg8_hash(filepath: Path) -> str:
+    """
+    Returns the md5-seg8 hash of the contents of `filepath`: the file is split
+    into `MD5_SEG8_LANES` contiguous segments, which are md5-hashed independently
+    (and in parallel, for large files), and the result is the md5 of the segment
+    digests, in order.
+
+    Lanes of large files are hashed on a single thread pool shared by all
+    callers, so hashing many files at once (e.g., with `hash_files`) adds at
+    most `MD5_SEG8_LANES` threads rather than that many per file.
+
+    This is *not* interoperable with md5 (nor with rsync's MD5P8), so it should
+    only be compared against other md5-seg8 hashes.
+    """
+    log.debug(f"Computing md5-seg8 hash for: {filepath}")
+    file_size = filepath.stat().st_size
+    if file_size <= MMAP_THRESHOLD:
+        return _md5_seg8_hexdigest(filepath.read_bytes())
+
+    with filepath.open("rb") as f:
+        with _mmap_for_sequential_read(f.fileno(), file_size=file_size) as mm:
+            return _md5_seg8_hexdigest(mm)
+
+
+def _md5_seg8_hexdigest(data: bytes | mmap.mmap) -> str:
+    # every lane but the last holds a whole number of 64-byte md5 blocks
+    lane_size = -(-len(data) // (MD5_SEG8_LANES * 64)) * 64
+    with memoryview(data) as view:
+        lanes = [
+            view[i * lane_size : (i + 1) * lane_size] for i in range(MD5_SEG8_LANES)
+        ]
+        try:
+            if len(data) < MD5_SEG8_MULTITHREADING_THRESHOLD:
+                digests = [_md5(lane).digest() for lane in lanes]
+            else:
+                # `hashlib` releases the GIL while hashing, so lanes run in parallel
+                executor = _md5_seg8_executor()
+                digests = list(executor.map(lambda b: _md5(b).digest(), lanes))
+        finally:
+            # `mm` cannot be closed while views into it are alive
+            for lane in lanes:
+                lane.release()
+    return _md5(b"".join(digests)).hexdigest()
+
+
+@functools.cache
+def _md5_seg8_executor() -> ThreadPoolExecutor:
+    # created on first use, and its (idle) threads are reused across files
+    return ThreadPoolExecutor(max_workers=MD5_SEG8_LANES)
+
+
+def compute_md5_hash_batch(filepaths: list[Path]) -> list[str]:
+    """
+    Returns the md5 hashes of `filepaths`, in the same order.
+
+    Files are hashed (with `hash_files`) up to `MD5_BATCH_LANES` at a time, one
+    lane per file. Each digest is still a single serial md5 chain, but `hashlib`
+    releases the GIL while hashing large buffers, so lanes run in parallel.
+    """
+    return [md5 for _, md5 in hash_files(filepaths, workers=MD5_BATCH_LANES)]
+
+
+def hash_files(
+    filepaths: Iterable[Path],
+    *,
+    algorithm: str = "md5",
+    workers: Optional[int] = None,
+) -> Iterator[tuple[Path, str]]:
+    """
+    Yields `(filepath, hash)` for each of `filepaths`, in order, hashing up to
+    `workers` files concurrently (one per CPU by default).
+
+    `algorithm` is "md5" (see `compute_md5_hash`) or anything accepted by
+    `compute_content_hash`; for large deduplication scans, "blake3" or
+    "sha256" are usually faster.
+
+    `filepaths` is consumed lazily, so it can be fed straight from `find_files`:
+    only a bounded number of files are in flight at any time.
+    """
+    hasher: Callable[[Path], str] = compute_md5_hash
+    if algorithm != "md5":
+        hasher = functools.partial(compute_content_hash, algorithm=algorithm)
+
+    workers = workers or os.cpu_count() or 1
+    pending: deque[tuple[Path, Future[str]]] = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for filepath in filepaths:
+            pending.append((filepath, executor.submit(hasher, filepath)))
+            if len(pending) >= 2 * workers:
+                path, future = pending.popleft()
+                yield path, future.result()
+        while pending:
+            path, future = pending.popleft()
+            yield path, future.result()
+
+
+def compute_weak_hash(
+    filepath: Path,
+    *,
+    file_size: int,
+    chunk_size: int = SMALL_CHUNK_SIZE,
+    algorithm: str = "md5",
+) -> str:
+    # positional reads need no seeking, and feeding both chunks to the hash
+    # avoids concatenating them first
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        # `file_size` may be stale (e.g., from an earlier scan), so chunks are
+        # located from the actual end of the file
+        actual_size = os.fstat(fd).st_size
+        weak_hash = hashlib.new(algorithm, usedforsecurity=False)
         if file_size <= chunk_size:
-            data = f.read()  # Read the entire file if it's smaller than chunk_size
+            # Read the entire file if it's smaller than chunk_size
+            weak_hash.update(os.pread(fd, actual_size, 0))
         else:
-            first_chunk = f.read(chunk_size)
-            f.seek(-chunk_size, os.SEEK_END)
-            last_chunk = f.read(chunk_size)
-            data = first_chunk + last_chunk
-    return hashlib.md5(data).hexdigest()
+            weak_hash.update(os.pread(fd, chunk_size, 0))
+            tail_offset = max(0, actual_size - chunk_size)
+            weak_hash.update(os.pread(fd, chunk_size, tail_offset))
+    finally:
+        os.close(fd)
+    return weak_hash.hexdigest()
+
+
+_HEX_DIGITS = b"0123456789abcdefABCDEF"
+
+
+def looks_like_hex_hash(s: str, length: int = 64) -> bool:
+    """
+    Returns `True` if `s` is a hex digest of `length` characters (64 for
+    sha256, 32 for md5).
+    """
+    # deleting every hex digit in a single C-level pass is ~2x faster than a
+    # regex match, and leaves nothing behind only for valid digests
+    return (
+        len(s) == length
+        and s.isascii()
+        and not s.encode("ascii").translate(None, _HEX_DIGITS)
+    )
 
 
 def looks_like_md5_hash(s: str) -> bool:
-    return bool(re.fullmatch(r"[a-fA-F0-9]{32}", s))
+    return looks_like_hex_hash(s, length=32)
 
 
 # ==============================================================================
@@ -70,21 +429,89 @@ WILDCARD_EXTENSION = ".*"
 DEFAULT_EXCLUDED_DIRS = (".git", ".pytest_cache", ".mypy_cache", "__pycache__")
 
 
+class FileEntry(NamedTuple):
+    path: Path
+    size: int
+    mtime_ns: int
+    inode: int
+
+
 def find_files(
     root: Path,
     *,
     extensions: tuple[str, ...] = (WILDCARD_EXTENSION,),
     excluded_dirs: tuple[str, ...] = DEFAULT_EXCLUDED_DIRS,
 ) -> Iterator[Path]:
-    def _find_files(root: Path) -> Iterator[Path]:
-        for path in root.iterdir():
-            if path.is_dir():
-                if path.name not in excluded_dirs:
-                    yield from _find_files(path)
-            elif matches_any_extension(path, extensions):
-                yield path
+    for path, _ in _scan_files(root, extensions, excluded_dirs):
+        yield path
+
 
-    yield from _find_files(root)
+def scan_files(
+    root: Path,
+    *,
+    extensions: tuple[str, ...] = (WILDCARD_EXTENSION,),
+    excluded_dirs: tuple[str, ...] = DEFAULT_EXCLUDED_DIRS,
+) -> Iterator[FileEntry]:
+    """
+    Like `find_files`, but yields each file along with its size, modification
+    time and inode, so callers don't need to `stat` it again (e.g., to pass
+    `file_size` to `compute_weak_hash`).
+    """
+    for path, entry in _scan_files(root, extensions, excluded_dirs):
+        try:
+            st = entry.stat()
+        except OSError:
+            # broken symlinks (which `find_files` also yields) describe the link
+            st = entry.stat(follow_symlinks=False)
+        yield FileEntry(path, st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def walk_and_hash(
+    root: Path,
+    *,
+    extensions: tuple[str, ...] = (WILDCARD_EXTENSION,),
+    excluded_dirs: tuple[str, ...] = DEFAULT_EXCLUDED_DIRS,
+    algorithm: str = "md5",
+    workers: Optional[int] = None,
+) -> Iterator[tuple[Path, str]]:
+    """
+    Yields `(filepath, hash)` for every file `find_files` would yield, in the
+    same order.
+
+    Drop-in replacement for hashing the output of `find_files` one file at a
+    time: the traversal (single `scandir` pass per directory) feeds `hash_files`
+    directly, so reading and hashing files overlaps with walking the tree.
+    """
+    filepaths = find_files(root, extensions=extensions, excluded_dirs=excluded_dirs)
+    yield from hash_files(filepaths, algorithm=algorithm, workers=workers)
+
+
+def _scan_files(
+    root: Path, extensions: tuple[str, ...], excluded_dirs: tuple[str, ...]
+) -> Iterator[tuple[Path, os.DirEntry[str]]]:
+    # resolved once here, rather than per file
+    matches_all = WILDCARD_EXTENSION in extensions
+    extensions_set = frozenset(extensions)
+    excluded_dirs_set = frozenset(excluded_dirs)
+
+    def _scan(root: Path) -> Iterator[tuple[Path, os.DirEntry[str]]]:
+        subdirs = []
+        # `DirEntry.is_dir` relies on the file type reported by `readdir`, so
+        # (unlike `Path.is_dir`) it doesn't need a `stat` call per entry
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if _is_dir(entry):
+                    if entry.name not in excluded_dirs_set:
+                        subdirs.append(Path(entry.path))
+                else:
+                    path = Path(entry.path)
+                    if matches_all or path.suffix in extensions_set:
+                        yield path, entry
+        # recurse only after closing `entries`, so open handles don't pile up
+        for subdir in subdirs:
+            yield from _scan(subdir)
+
+    yield from _scan(root)
 
 
 def find_empty_directories(root: Path, recursively: bool = True) -> Iterator[Path]:
@@ -99,15 +526,34 @@ def find_empty_directories(root: Path, recursively: bool = True) -> Iterator[Pat
     if not root.is_dir():
         raise ValueError(f"{root} is not a directory")
 
-    def _find(root: Path) -> Iterator[Path]:
-        for path in root.iterdir():
-            if path.is_dir() and recursively:
-                yield from _find(path)
-
-        if not any(root.iterdir()):
-            yield root
-
-    yield from _find(root)
+    def _scan(dirpath: Path) -> tuple[Path, bool, list[Path], Iterator[Path]]:
+        subdirs = []
+        has_files = False
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                if _is_dir(entry):
+                    subdirs.append(Path(entry.path))
+                else:
+                    has_files = True
+        unvisited = iter(subdirs if recursively else [])
+        return dirpath, has_files, subdirs, unvisited
+
+    # an explicit stack (rather than recursion) supports arbitrarily deep trees
+    stack = [_scan(root)]
+    while stack:
+        dirpath, has_files, subdirs, unvisited = stack[-1]
+        subdir = next(unvisited, None)
+        if subdir is not None:
+            stack.append(_scan(subdir))
+            continue
+
+        stack.pop()
+        if has_files:
+            continue
+        # the caller may have removed subdirectories yielded earlier, so only a
+        # directory with subdirectories needs to be read a second time
+        if not subdirs or (recursively and not _has_entries(dirpath)):
+            yield dirpath
 
 
 def find_child_dir(path: Path, name: str) -> Optional[Path]:
@@ -119,10 +565,7 @@ def find_child_dir(path: Path, name: str) -> Optional[Path]:
 
 
 def matches_any_extension(filepath: Path, extensions: tuple[str, ...]) -> bool:
-    for extension in extensions:
-        if extension == WILDCARD_EXTENSION or filepath.suffix == extension:
-            return True
-    return False
+    return WILDCARD_EXTENSION in extensions or filepath.suffix in extensions
 
 
 # ==============================================================================
@@ -146,12 +589,13 @@ def count_dir_files(path: Path) -> int:
     Returns the number of files and directories under the directory pointed
     by `path`.
     """
-    return sum(1 for _ in path.iterdir())
+    with os.scandir(path) as entries:
+        return sum(1 for _ in entries)
 
 
 def is_empty_dir(path: Path) -> bool:
     """Returns `True` if `path` points to an empty directory."""
-    return path.is_dir() and not any(path.iterdir())
+    return path.is_dir() and not _has_entries(path)
 
 
 def ensure_dir(path: Path) -> Path:
@@ -164,22 +608,43 @@ def ensure_dir(path: Path) -> Path:
 
 def get_children_dirs(dirpath: Path) -> Iterator[Path]:
     """Returns all direct children directories of `dirpath`."""
-    for path in dirpath.iterdir():
-        if path.is_dir():
-            yield path
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            if _is_dir(entry):
+                yield Path(entry.path)
+
+
+def _is_dir(entry: os.DirEntry[str]) -> bool:
+    """
+    Like `entry.is_dir()`, but (as `Path.is_dir`) returns `False` instead of
+    raising for entries that cannot be resolved (e.g., symlink loops).
+    """
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _has_entries(dirpath: Path) -> bool:
+    """Returns `True` if `dirpath` contains anything, reading at most one entry."""
+    with os.scandir(dirpath) as entries:
+        return next(entries, None) is not None
 
 
 # ==============================================================================
 # Path Manipulation
 # ==============================================================================
-def safely_to_relative(path: Path) -> Path:
+def safely_to_relative(path: Path, *, cwd: Optional[Path] = None) -> Path:
     """
     Returns the relative version of `path` with respect to the working directory;
     if the working directory is not a parent of `path`, it simply returns `path`
     unchanged.
+
+    When converting many paths, pass `cwd=Path.cwd()` once to avoid a `getcwd`
+    call per path.
     """
     try:
-        return path.relative_to(Path.cwd())
+        return path.relative_to(cwd or Path.cwd())
     except ValueError:
         return path
 
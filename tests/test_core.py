@@ -1,6 +1,31 @@
+import hashlib
+import os
+import sys
+import time
 from pathlib import Path
 
-from filesystem.core import find_empty_directories
+import pytest
+
+from filesystem.core import (
+    compute_blake3_hash,
+    compute_content_hash,
+    compute_fast_fingerprint,
+    compute_md5_hash,
+    compute_md5_hash_batch,
+    compute_md5_hash_cached,
+    compute_md5_hash_ssd,
+    compute_md5_seg8_hash,
+    compute_weak_hash,
+    find_empty_directories,
+    find_files,
+    get_children_dirs,
+    hash_files,
+    looks_like_hex_hash,
+    looks_like_md5_hash,
+    safely_to_relative,
+    scan_files,
+    walk_and_hash,
+)
 
 
 # Support code for tests
@@ -26,6 +51,16 @@ def setup_test_folder(
             (folder / file).write_text("dummy content")
 
 
+def write_files(root: Path, contents: list[bytes]) -> list[Path]:
+    """Writes each of `contents` to its own file under `root`, in order."""
+    paths = []
+    for i, content in enumerate(contents):
+        path = root / f"file-{i}.bin"
+        path.write_bytes(content)
+        paths.append(path)
+    return paths
+
+
 # Tests
 # ------------------------------------------------------------------------------
 def test_can_find_immediate_empty_folders(tmp_path: Path) -> None:
@@ -65,3 +100,213 @@ def test_can_find_nested_empty_folders_dynamically(tmp_path: Path) -> None:
     second.rmdir()
     # after deleting the two nested folders, the parent should now be empty too
     assert next(folders) == (tmp_path / "empties-parent")
+
+
+def test_can_find_empty_folder_deeper_than_recursion_limit(tmp_path: Path) -> None:
+    chain = []
+    try:
+        deepest = str(tmp_path)
+        for _ in range(sys.getrecursionlimit() + 100):
+            deepest = os.path.join(deepest, "d")
+            os.mkdir(deepest)
+            chain.append(deepest)
+        assert list(find_empty_directories(tmp_path)) == [Path(deepest)]
+    finally:
+        # shutil.rmtree recurses on Python 3.11, so pytest's tmp_path cleanup
+        # would hit the same limit; tear the chain down bottom-up instead.
+        for directory in reversed(chain):
+            os.rmdir(directory)
+
+
+def test_batch_md5_hashes_match_hashlib_in_order(tmp_path: Path) -> None:
+    contents = [b"", b"a", b"dummy content", b"x" * 100_000] * 3
+    paths = write_files(tmp_path, contents)
+    expected = [hashlib.md5(content).hexdigest() for content in contents]
+    assert compute_md5_hash_batch(paths) == expected
+
+
+def test_md5_hash_matches_hashlib(tmp_path: Path) -> None:
+    large = bytes(range(256)) * 12_345  # spans several read chunks
+    contents = [b"", b"dummy content", b"x" * 100_000, large]
+    for path, content in zip(write_files(tmp_path, contents), contents):
+        assert compute_md5_hash(path) == hashlib.md5(content).hexdigest()
+        assert compute_md5_hash(path, chunk_size=4096) == compute_md5_hash(path)
+
+
+def test_content_hash_defaults_to_sha256(tmp_path: Path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"dummy content")
+    digest = compute_content_hash(path)
+    assert digest == hashlib.sha256(b"dummy content").hexdigest()
+    assert looks_like_hex_hash(digest)
+    assert not looks_like_md5_hash(digest)
+    assert looks_like_md5_hash(compute_content_hash(path, "md5"))
+
+
+def test_content_hash_rejects_variable_length_algorithms(tmp_path: Path) -> None:
+    [path] = write_files(tmp_path, [b"dummy content"])
+    with pytest.raises(ValueError):
+        compute_content_hash(path, "shake_128")
+    with pytest.raises(ValueError):
+        list(hash_files([path], algorithm="shake_256"))
+
+
+def test_blake3_hash_matches_blake3_for_small_and_large_files(tmp_path: Path) -> None:
+    blake3 = pytest.importorskip("blake3")
+    contents = [b"", b"dummy content", b"x" * (2 * 1024 * 1024)]
+    for path, content in zip(write_files(tmp_path, contents), contents):
+        assert compute_blake3_hash(path) == blake3.blake3(content).hexdigest()
+
+
+def test_fast_fingerprint_changes_with_file_contents(tmp_path: Path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_text("dummy content")
+    fingerprint = compute_fast_fingerprint(path)
+    assert compute_fast_fingerprint(path) == fingerprint
+
+    path.write_text("dummy content, now longer")
+    assert compute_fast_fingerprint(path) != fingerprint
+
+
+def test_find_files_filters_extensions_and_skips_excluded_dirs(tmp_path: Path) -> None:
+    setup_test_folder(
+        root=tmp_path,
+        empty_dirs=["empty"],
+        non_empty_dirs={
+            "docs": ["a.txt", "b.md"],
+            "docs/nested": ["c.txt"],
+            ".git": ["d.txt"],
+        },
+    )
+    result = {
+        p.relative_to(tmp_path) for p in find_files(tmp_path, extensions=(".txt",))
+    }
+    assert result == {Path("docs/a.txt"), Path("docs/nested/c.txt")}
+
+
+def test_looks_like_md5_hash_rejects_non_hex_and_wrong_lengths() -> None:
+    assert looks_like_md5_hash("d41d8cd98f00b204e9800998ecf8427E")
+    assert not looks_like_md5_hash("d41d8cd98f00b204e9800998ecf8427g")
+    assert not looks_like_md5_hash("d41d8cd98f00b204e9800998ecf8427")
+    assert not looks_like_md5_hash("\u0661" * 32)  # non-ascii digits
+
+
+def test_md5_hash_ssd_matches_hashlib_below_and_above_mmap_threshold(
+    tmp_path: Path,
+) -> None:
+    contents = [b"", b"dummy content", b"x" * 1_000_000]
+    for path, content in zip(write_files(tmp_path, contents), contents):
+        assert compute_md5_hash_ssd(path) == hashlib.md5(content).hexdigest()
+
+
+def test_weak_hash_covers_first_and_last_chunks(tmp_path: Path) -> None:
+    small, large = b"dummy content", b"a" * 4096 + b"b" * 10_000 + b"c" * 4096
+    for path, content in zip(write_files(tmp_path, [small, large]), [small, large]):
+        expected = content if content == small else content[:4096] + content[-4096:]
+        weak_hash = compute_weak_hash(path, file_size=len(content), chunk_size=4096)
+        assert weak_hash == hashlib.md5(expected).hexdigest()
+
+
+def test_weak_hash_reads_last_chunk_from_actual_end_of_file(tmp_path: Path) -> None:
+    [path] = write_files(tmp_path, [b"a" * 4096 + b"b" * 10_000])
+    stale_size = path.stat().st_size
+    with path.open("ab") as f:
+        f.write(b"c" * 4096)
+
+    weak_hash = compute_weak_hash(path, file_size=stale_size, chunk_size=4096)
+    assert weak_hash == hashlib.md5(b"a" * 4096 + b"c" * 4096).hexdigest()
+
+
+def test_hash_files_yields_md5_hashes_in_input_order(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, [f"content {i}".encode() for i in range(20)])
+
+    result = list(hash_files(iter(paths), workers=3))
+    assert result == [(p, hashlib.md5(p.read_bytes()).hexdigest()) for p in paths]
+
+    result = list(hash_files(paths, algorithm="sha256"))
+    assert result == [(p, hashlib.sha256(p.read_bytes()).hexdigest()) for p in paths]
+
+
+def test_scan_files_reports_file_sizes(tmp_path: Path) -> None:
+    setup_test_folder(
+        root=tmp_path, empty_dirs=[], non_empty_dirs={"docs": ["a.txt", "b.md"]}
+    )
+    [entry] = scan_files(tmp_path, extensions=(".md",))
+    assert entry.path == tmp_path / "docs" / "b.md"
+    assert entry.size == len("dummy content")
+    assert entry.inode == entry.path.stat().st_ino
+
+
+def test_scan_files_reports_dangling_symlinks_as_links(tmp_path: Path) -> None:
+    (tmp_path / "dangling").symlink_to(tmp_path / "missing")
+    [entry] = scan_files(tmp_path)
+    assert entry.path == tmp_path / "dangling"
+    assert entry.inode == entry.path.lstat().st_ino
+
+
+def test_cached_md5_hash_is_recomputed_when_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"dummy content")
+    expected = hashlib.md5(b"dummy content").hexdigest()
+    assert compute_md5_hash_cached(path) == expected
+    assert compute_md5_hash_cached(path) == expected
+
+    path.write_bytes(b"other content, longer")
+    expected = hashlib.md5(b"other content, longer").hexdigest()
+    assert compute_md5_hash_cached(path) == expected
+
+
+def test_cached_md5_hash_detects_rewrite_with_restored_mtime(tmp_path: Path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"dummy content")
+    st = path.stat()
+    assert compute_md5_hash_cached(path) == hashlib.md5(b"dummy content").hexdigest()
+
+    # same size, and mtime restored afterwards (as `cp -p` or `rsync -t` do)
+    time.sleep(0.01)
+    path.write_bytes(b"DUMMY CONTENT")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert compute_md5_hash_cached(path) == hashlib.md5(b"DUMMY CONTENT").hexdigest()
+
+
+def test_md5_seg8_hash_combines_md5_of_eight_segments(tmp_path: Path) -> None:
+    large = bytes(range(256)) * 8_000  # large enough to hash lanes in parallel
+    contents = [b"", b"dummy content", b"x" * 100_000, large]
+    for path, content in zip(write_files(tmp_path, contents), contents):
+        lane_size = -(-len(content) // 512) * 64
+        lanes = [content[i * lane_size : (i + 1) * lane_size] for i in range(8)]
+        digests = b"".join(hashlib.md5(lane).digest() for lane in lanes)
+        assert compute_md5_seg8_hash(path) == hashlib.md5(digests).hexdigest()
+        assert compute_content_hash(path, "md5-seg8") == compute_md5_seg8_hash(path)
+
+
+def test_walk_and_hash_matches_find_files_then_hash(tmp_path: Path) -> None:
+    setup_test_folder(
+        root=tmp_path,
+        empty_dirs=["empty"],
+        non_empty_dirs={"docs": ["a.txt", "b.md"], "docs/nested": ["c.txt"]},
+    )
+    expected = [
+        (p, hashlib.md5(p.read_bytes()).hexdigest())
+        for p in find_files(tmp_path, extensions=(".txt",))
+    ]
+    assert list(walk_and_hash(tmp_path, extensions=(".txt",))) == expected
+
+
+def test_traversals_treat_broken_symlinks_as_files(tmp_path: Path) -> None:
+    setup_test_folder(
+        root=tmp_path, empty_dirs=["empty"], non_empty_dirs={"docs": ["a.txt"]}
+    )
+    (tmp_path / "loop").symlink_to(tmp_path / "loop")
+    (tmp_path / "dangling").symlink_to(tmp_path / "missing")
+
+    result = {p.relative_to(tmp_path) for p in find_files(tmp_path)}
+    assert result == {Path("docs/a.txt"), Path("loop"), Path("dangling")}
+    assert {p.name for p in get_children_dirs(tmp_path)} == {"empty", "docs"}
+    assert list(find_empty_directories(tmp_path)) == [tmp_path / "empty"]
+
+
+def test_safely_to_relative_uses_given_cwd(tmp_path: Path) -> None:
+    path = tmp_path / "docs" / "a.txt"
+    assert safely_to_relative(path, cwd=tmp_path) == Path("docs/a.txt")
+    assert safely_to_relative(path, cwd=tmp_path / "other") == path